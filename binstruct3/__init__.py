@@ -1,12 +1,19 @@
 import copy
+import functools
 import inspect
 import io
 import struct
+import sys
 import locale
 
 # simple storage class descriptor
 from abc import ABC, abstractmethod
-from typing import Type, Union, Any, Optional, BinaryIO, Generator, Tuple
+from typing import Type, Union, Any, Optional, BinaryIO, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 class Binstruct3Error(Exception):
@@ -19,6 +26,10 @@ class FieldError(Binstruct3Error):
         self.field_name = field_name
 
 
+# packers let struct.error of a short read propagate, it is reported together with the field name
+_UNPACK_ERRORS = (Binstruct3Error, struct.error)
+
+
 # ABC for transforming python-object to and from bytes
 class Packer(ABC):
 
@@ -51,14 +62,16 @@ class Field:
     def __init__(self):
         super().__init__()
         self.storage = ""
+        # name of the instance slot keeping the value
+        self.slot = ""
 
     def __get__(self, instance, owner):
         if instance is None:
             return self
-        return getattr(instance, self.storage)
+        return getattr(instance, self.slot)
 
     def __set__(self, instance, value):
-        setattr(instance, self.storage, value)
+        setattr(instance, self.slot, value)
 
     def fill(self, instance, inpstream: Optional[Any] = None):
         pass
@@ -70,26 +83,55 @@ class Field:
         pass
 
 
+# number of padding bytes needed after offs to reach a multiple of align
+def _padding(offs: int, align: int) -> int:
+    return (align - offs % align) % align
+
+
 # Packable interface
 class Packable:
 
-    def fields(self) -> Generator[Tuple[str, Field], None, None]:
-        supercls = type(self).__mro__[1]
-        for name, obj in supercls.__dict__.items():
-            if isinstance(obj, Field):
-                yield name, obj
-
-    def reload(self, stream: Union[BinaryIO, bytes, bytearray, None] = None):
-        align = getattr(self, "_align", 1)
+    _align = 1
+    # the size of the whole struct is padded to a multiple of it
+    _pad_to = 1
+
+    # (name, field) pairs in declaration order, filled once by the packable decorator
+    _fields_cache: Tuple[Tuple[str, Field], ...] = ()
+    # byte size of a struct which has fixed-size fields only, None otherwise
+    _static_size: Optional[int] = None
+    # reads count records from bytes at once, generated for fixed-size classes without __init__
+    _read_records = None
+    # (byte order, format, value count) of a class packed with one struct, which containing structs and
+    # arrays merge into their own struct. _from_values and _to_values convert an instance from and to the values
+    _record_format: Optional[Tuple[str, str, int]] = None
+    # end of the last field in the record, the trailing padding after it may be missing from a short read
+    _record_end = 0
+    # numpy structured dtype of a struct which has numeric fields only, None otherwise
+    _np_dtype = None
+
+    def fields(self) -> Tuple[Tuple[str, Field], ...]:
+        return self._fields_cache
+
+    def reload(self, stream: Union[BinaryIO, bytes, bytearray, memoryview, None] = None):
+        align = self._align
         stream = self.get_stream(stream)
-        start = stream.tell() if stream else 0
-        for name, obj in self.fields():
+        if not stream or (align == 1 and self._pad_to == 1):
+            # no padding to skip, the stream position is not needed
+            for name, obj in self._fields_cache:
+                obj.fill(self, stream)
+            return
+        # the offset is counted from the field sizes, the stream does not have to support tell()
+        offs = 0
+        for name, obj in self._fields_cache:
             obj.fill(self, stream)
-            if stream:
-                offs = stream.tell() - start
-                skip = (align - offs % align) % align
-                if skip:
-                    stream.read(skip)
+            offs += obj.byte_size(self)
+            skip = _padding(offs, align)
+            if skip:
+                stream.read(skip)
+                offs += skip
+        skip = _padding(offs, self._pad_to)
+        if skip:
+            stream.read(skip)
 
     def to_bytes(self) -> bytes:
         out = io.BytesIO()
@@ -97,24 +139,34 @@ class Packable:
         return out.getvalue()
 
     def dump(self, stream: BinaryIO):
-        align = getattr(self, "_align", 1)
+        align = self._align
         stream = self.get_stream(stream)
-        start = stream.tell()
-        for name, obj in self.fields():
+        if align == 1 and self._pad_to == 1:
+            for name, obj in self._fields_cache:
+                obj.write(self, stream)
+            return
+        offs = 0
+        for name, obj in self._fields_cache:
             obj.write(self, stream)
-            offs = stream.tell() - start
-            skip = (align - offs % align) % align
+            offs += obj.byte_size(self)
+            skip = _padding(offs, align)
             if skip:
                 stream.write(b"\x00" * skip)
+                offs += skip
+        skip = _padding(offs, self._pad_to)
+        if skip:
+            stream.write(b"\x00" * skip)
 
     def byte_size(self) -> int:
-        ret = 0
-        align = getattr(self, "_align", 1)
-        for name, field in self.fields():
-            ret += field.byte_size(self)
-            skip = (align - ret % align) % align
-            ret += skip
-        return ret
+        align = self._align
+        if align == 1:
+            ret = sum(field.byte_size(self) for name, field in self._fields_cache)
+        else:
+            ret = 0
+            for name, field in self._fields_cache:
+                ret += field.byte_size(self)
+                ret += _padding(ret, align)
+        return ret + _padding(ret, self._pad_to)
 
     def zeroise(self):
         c = bytes(self.byte_size())
@@ -122,23 +174,44 @@ class Packable:
 
 
     def clone(self) -> "Packable":
-        return copy.deepcopy(self)
+        # copies value by value, much cheaper than copy.deepcopy for the plain values fields hold
+        new = type(self).__new__(type(self))
+        for name, field in self._fields_cache:
+            setattr(new, field.slot, _copy_value(getattr(self, field.slot)))
+        d = new.__dict__
+        for key, val in self.__dict__.items():
+            d[key] = _copy_value(val)
+        return new
 
     @staticmethod
     def get_stream(obj):
-        if isinstance(obj, (bytes, bytearray)):
+        if isinstance(obj, (bytes, bytearray, memoryview)):
             obj = io.BytesIO(obj)
         return obj
 
     @classmethod
-    def load(cls, stream: Union[BinaryIO, bytes, bytearray, None], count: int = 1):
-        stream = cls.get_stream(stream)
-
+    def load(cls, stream: Union[BinaryIO, bytes, bytearray, memoryview, None], count: int = 1):
         if not (isinstance(count, int)):
             raise ValueError("count should be int")
         if count < 1:
             raise ValueError("count should be > 0")
 
+        if cls._read_records is not None and isinstance(stream, (bytes, bytearray)) \
+                and len(stream) >= count * cls._static_size:
+            # the records are unpacked from the bytes in place, without a BytesIO and a copy of the data
+            ret = cls._read_records(stream, count)
+            return ret[0] if count == 1 else ret
+
+        stream = cls.get_stream(stream)
+        if stream and cls._read_records is not None:
+            size = count * cls._static_size
+            dat = stream.read(size)
+            if len(dat) == size:
+                ret = cls._read_records(dat, count)
+                return ret[0] if count == 1 else ret
+            # the records are read one by one again to report the field which is missing
+            stream = io.BytesIO(dat)
+
         ret = []
         for i in range(count):
             obj = cls()
@@ -148,6 +221,43 @@ class Packable:
             return ret[0]
         return ret
 
+    # reads count records of a struct with numeric fields only into a numpy structured array,
+    # without creating an object per record
+    @classmethod
+    def load_many(cls, stream: Union[BinaryIO, bytes, bytearray, memoryview], count: int):
+        if np is None:
+            raise ImportError("load_many requires numpy to be installed")
+        if cls._np_dtype is None:
+            raise Binstruct3Error(f"{cls.__mro__[1].__name__} has no numpy layout, only numeric fields are supported")
+        if not (isinstance(count, int)):
+            raise ValueError("count should be int")
+        if count < 1:
+            raise ValueError("count should be > 0")
+
+        size = count * cls._np_dtype.itemsize
+        dat = stream if isinstance(stream, (bytes, bytearray)) else cls.get_stream(stream).read(size)
+        if len(dat) < size:
+            raise Binstruct3Error(f"Incomplete data:  needed {size} bytes, present {len(dat)} bytes")
+        return np.frombuffer(dat, dtype=cls._np_dtype, count=count).copy()
+
+
+_IMMUTABLE_TYPES = (int, float, str, bytes, bool, type(None))
+
+
+def _copy_value(val):
+    if isinstance(val, _IMMUTABLE_TYPES):
+        return val
+    if isinstance(val, list):
+        return [_copy_value(x) for x in val]
+    if isinstance(val, Packable):
+        return val.clone()
+    if np is not None and isinstance(val, np.ndarray):
+        return val.copy()
+    return copy.deepcopy(val)
+
+
+_BYTE_ORDER_CHARS = "@=<>!"
+
 
 class RawPacker(Packer):
 
@@ -155,21 +265,44 @@ class RawPacker(Packer):
         super().__init__()
         self._format_str = format_str
         self._default_val = default_val
-        self._sz = struct.calcsize(self._format_str)
-
+        self._compile()
+
+    def _compile(self):
+        # struct.Struct parses the format once; bound methods skip attribute lookups on the hot path
+        self._struct = struct.Struct(self._format_str)
+        self._sz = self._struct.size
+        self._pack = self._struct.pack
+        self._unpack = self._struct.unpack
+        # single integer formats are validated by a range check instead of packing the value
+        self._range = None
+        body = self._format_str.lstrip(_BYTE_ORDER_CHARS)
+        if len(body) == 1 and body in "bBhHiIlLqQnN":
+            bits = 8 * self._sz
+            self._range = (-(1 << bits - 1), (1 << bits - 1) - 1) if body.islower() else (0, (1 << bits) - 1)
+
+    # attributes made by _compile, they are not copied or pickled
+    _compiled_attrs = ("_struct", "_pack", "_unpack")
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for name in self._compiled_attrs:
+            del state[name]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._compile()
+
+    # struct.error is not caught here, the caller turns it into a field or element error once
     def unpack(self, stream):
-        try:
-            dat = stream.read(self._sz)
-            val = struct.unpack(self._format_str, dat)
-            if len(val) == 1:
-                val = val[0]
-        except struct.error as e:
-            raise Binstruct3Error(str(e))
+        val = self._unpack(stream.read(self._sz))
+        if len(val) == 1:
+            val = val[0]
         return val
 
     def pack(self, stream, obj):
         try:
-            dat = struct.pack(self._format_str, obj)
+            dat = self._pack(obj)
         except struct.error as e:
             raise Binstruct3Error(str(e))
         stream.write(dat)
@@ -181,20 +314,37 @@ class RawPacker(Packer):
         return self._default_val
 
     def validate_value(self, obj):
-        if obj is not None:
-            try:
-                struct.pack(self._format_str, obj)
-            except struct.error as e:
-                raise Binstruct3Error(str(e))
+        if obj is None:
+            return
+        if type(obj) is int and self._range is not None:
+            low, high = self._range
+            if not low <= obj <= high:
+                raise Binstruct3Error(f"'{self._format_str}' format requires {low} <= number <= {high}")
+            return
+        try:
+            self._pack(obj)
+        except struct.error as e:
+            raise Binstruct3Error(str(e))
 
     def __call__(self, default_val=None):
         default_val = default_val or self._default_val
-        return RawPacker(self._format_str, default_val)
+        try:
+            return _make_raw(self._format_str, default_val)
+        except TypeError:
+            # an unhashable default can not be a cache key
+            return RawPacker(self._format_str, default_val)
 
     def __getitem__(self, item: int) -> "ArrayPacker":
         return ArrayPacker(self, item, defining=1)
 
 
+# packers are never modified after creation, so equal ones can be shared between fields.
+# typed keeps e.g. the defaults 1 and True apart
+@functools.lru_cache(maxsize=256, typed=True)
+def _make_raw(format_str: str, default_val=None) -> RawPacker:
+    return RawPacker(format_str, default_val)
+
+
 int8 = RawPacker("b")
 uint8 = RawPacker("B")
 int16 = RawPacker("h")
@@ -205,37 +355,63 @@ int64 = RawPacker("q")
 uint64 = RawPacker("Q")
 
 
+# the C and POSIX locales have no encoding
+_DEFAULT_ENCODING = locale.getdefaultlocale()[1] or "utf-8"
+
+
+# returns the function decoding the raw bytes of a chars field into str
+def _chars_decoder(encoding: str, terminate_at_first_zero: bool):
+    if "\x00".encode(encoding) != b"\x00":
+        # other characters may contain zero bytes, e.g. in UTF-16, the zeros are searched after decoding
+        if terminate_at_first_zero:
+            return lambda val: val.decode(encoding).partition("\x00")[0]
+        return lambda val: val.decode(encoding).rstrip("\x00")
+    # the padding is stripped from the raw bytes, so it is never decoded
+    if terminate_at_first_zero:
+        return lambda val: val.partition(b"\x00")[0].decode(encoding)
+    return lambda val: val.rstrip(b"\x00").decode(encoding)
+
+
 class CharsPacker(RawPacker):
 
     def __init__(self, default_val=None, byte_size: int = 1, encoding: Optional[str] = None,
                  terminate_at_first_zero: bool = True, defining:int = 0):
-        super().__init__(format_str=str(byte_size) + "s", default_val=default_val)
-        self._encoding = encoding or locale.getdefaultlocale()[1]
+        self._encoding = encoding or _DEFAULT_ENCODING
         self._terminate_at_first_zero = terminate_at_first_zero
         self._defining = defining
+        super().__init__(format_str=str(byte_size) + "s", default_val=default_val)
+
+    _compiled_attrs = RawPacker._compiled_attrs + ("_decoder",)
+
+    def _compile(self):
+        super()._compile()
+        # the decoder is chosen once, so decoding a value does not test the options again.
+        # A subclass overriding _decode is called through its method
+        if type(self)._decode is CharsPacker._decode:
+            self._decoder = _chars_decoder(self._encoding, self._terminate_at_first_zero)
+        else:
+            self._decoder = self._decode
+
+    def _decode(self, val: bytes) -> str:
+        return _chars_decoder(self._encoding, self._terminate_at_first_zero)(val)
 
     def unpack(self, stream):
-        val = RawPacker.unpack(self, stream)
-        val = self._decode(val)
-        return val
+        return self._decoder(self._unpack(stream.read(self._sz))[0])
 
-    def _decode(self, val):
-        val = val.decode(self._encoding)
-        if self._terminate_at_first_zero:
-            idx = val.find("\x00")
-            return val if idx == -1 else val[:idx]
-        return val.rstrip('\x00')
-
-    def _encode(self, val: str):
-        val = val.encode(self._encoding)
-        if len(val) < self._sz:
-            val += b"\x00" * (self._sz - len(val))
-        return val
+    # struct pads the "s" format with zeros itself, the encoded value is not padded here
+    def _encode(self, val: str) -> bytes:
+        return val.encode(self._encoding)
 
+    # a string longer than the field is cut by pack, any str which can be encoded is valid
     def validate_value(self, obj):
-        if obj is not None:
-            val = self._encode(obj)
-            RawPacker.validate_value(self, val)
+        if obj is None:
+            return
+        if not isinstance(obj, str):
+            raise Binstruct3Error(f"value {obj!r} is not a str")
+        try:
+            obj.encode(self._encoding)
+        except UnicodeEncodeError as e:
+            raise Binstruct3Error(str(e))
 
     def pack(self, stream, obj):
         try:
@@ -246,9 +422,9 @@ class CharsPacker(RawPacker):
 
     def __getitem__(self, count) -> "CharsPacker":
         if self._sz == 1 and not self._defining:
-            return CharsPacker(None, count, self._encoding, self._terminate_at_first_zero, defining = 1)
+            return _make_chars(None, count, self._encoding, self._terminate_at_first_zero, 1)
         if self._defining:
-            packer = CharsPacker(None, count)
+            packer = _make_chars(None, count)
             return ArrayPacker(packer, self._sz)
 
         return ArrayPacker(self,count, defining=1)
@@ -258,17 +434,47 @@ class CharsPacker(RawPacker):
         default_val = default_val or self._default_val
         terminate_at_first_zero = terminate_at_first_zero or self._terminate_at_first_zero
         encoding = encoding or self._encoding
-        return CharsPacker(default_val, byte_size, encoding, terminate_at_first_zero)
+        return _make_chars(default_val, byte_size, encoding, terminate_at_first_zero)
+
+
+# packers are never modified after creation, so equal ones can be shared between fields
+@functools.lru_cache(maxsize=256)
+def _make_chars(default_val=None, byte_size: int = 1, encoding: Optional[str] = None,
+                terminate_at_first_zero: bool = True, defining: int = 0) -> CharsPacker:
+    return CharsPacker(default_val, byte_size, encoding, terminate_at_first_zero, defining)
 
 
 char = CharsPacker()
 
 
+# returns (byte order, format) of a packer which can be merged into a compound struct.Struct, None otherwise
+def _fusible_format(packer: Optional[Packer]) -> Optional[Tuple[str, str]]:
+    if not isinstance(packer, RawPacker):
+        return None
+    # merged values are converted by struct only, a subclass converting them in pack and unpack is kept apart
+    base = CharsPacker if isinstance(packer, CharsPacker) else RawPacker
+    if type(packer).unpack is not base.unpack or type(packer).pack is not base.pack:
+        return None
+    fmt = packer._format_str
+    order, body = (fmt[0], fmt[1:]) if fmt[:1] in _BYTE_ORDER_CHARS else ("@", fmt)
+    if order == "@":
+        # native alignment would insert padding between merged items, so standard sizes have to match instead
+        order = "="
+    try:
+        if struct.calcsize(order + body) != packer._sz or len(packer._unpack(bytes(packer._sz))) != 1:
+            return None
+    except struct.error:
+        return None
+    return order, body
+
+
 class StructPacker(Packer):
 
     def __init__(self, obj: Packable):
         super().__init__()
         self._packable = obj.clone()
+        # resolved when the nested class was decorated, None for classes of variable size
+        self._size = type(obj)._static_size
 
     def unpack(self, stream: BinaryIO):
         return self._packable.__class__.load(stream)
@@ -278,6 +484,8 @@ class StructPacker(Packer):
         pass
 
     def byte_size(self, obj) -> int:
+        if self._size is not None:
+            return self._size
         return obj.byte_size()
 
     def default_value(self):
@@ -296,41 +504,159 @@ class StructPacker(Packer):
 
 class ArrayPacker(Packer):
 
-    def __init__(self, obj: Union[Packer, Type[Packable]], count: int, defining: int = 0):
+    def __init__(self, obj: Union[Packer, Type[Packable]], count: int, defining: int = 0, numpy: bool = False):
         super().__init__()
         self._packer = get_packer(obj)
         self._cnt = count
         self._defining = defining
+        self._numpy = numpy
+        self._compile()
+
+    def _compile(self):
+        self._dtype = None
+        if self._numpy:
+            # numeric arrays are kept as numpy.ndarray, converted from and to bytes without per-element objects
+            if np is None:
+                raise ImportError("numpy arrays require numpy to be installed")
+            self._dtype = _numpy_dtype(self._packer)
+            if self._dtype is None:
+                raise ValueError("numpy arrays need a numeric element type")
+
+        # size of one element when it does not depend on the value, byte_size is then a product
+        self._elem_sz = self._dtype.itemsize if self._dtype is not None else _fixed_size(self._packer)
+
+        # arrays of scalars or strings, multidimensional ones too, are read and written with one struct.Struct
+        # for all elements. _nvals is the number of values the struct packs
+        self._batch = None
+        if self._dtype is not None:
+            return
+        if isinstance(self._packer, ArrayPacker):
+            inner = self._packer._batch
+            if inner is not None:
+                self._batch = struct.Struct(inner.format[0] + inner.format[1:] * self._cnt)
+                self._nvals = self._cnt * self._packer._nvals
+            return
+        if isinstance(self._packer, StructPacker):
+            record = type(self._packer._packable)._record_format
+            if record is not None:
+                self._batch = struct.Struct(record[0] + record[1] * self._cnt)
+                self._nvals = self._cnt * record[2]
+            return
+        fmt = _fusible_format(self._packer)
+        if fmt is not None:
+            order, body = fmt
+            # a count before "s" and "p" is a byte length, not a repeat count
+            repeat = len(body) == 1 and body not in "sp"
+            self._batch = struct.Struct(order + (f"{self._cnt}{body}" if repeat else body * self._cnt))
+            self._nvals = self._cnt
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_batch"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._compile()
 
     def unpack(self, stream):
+        if self._dtype is not None:
+            return self._unpack_numpy(stream)
+        if self._batch is not None:
+            return self._unpack_batch(stream)
         ret = []
-        for i in range(self._cnt):
-            try:
+        try:
+            for i in range(self._cnt):
                 ret.append(self._packer.unpack(stream))
-            except Binstruct3Error as e:
-                raise Binstruct3Error(f"element {i}: {str(e)}")
+        except _UNPACK_ERRORS as e:
+            raise Binstruct3Error(f"element {len(ret)}: {str(e)}")
         return ret
 
+    def _unpack_batch(self, stream):
+        dat = stream.read(self._batch.size)
+        if len(dat) != self._batch.size:
+            sz = self._batch.size // self._cnt
+            raise Binstruct3Error(f"element {len(dat) // sz}: unpack requires a buffer of {sz} bytes")
+        return self._from_batch(self._batch.unpack(dat))
+
+    # builds the array value from the flat values of the batch struct
+    def _from_batch(self, vals):
+        packer = self._packer
+        if isinstance(packer, ArrayPacker):
+            n = packer._nvals
+            return [packer._from_batch(vals[i * n:i * n + n]) for i in range(self._cnt)]
+        if isinstance(packer, StructPacker):
+            cls = type(packer._packable)
+            n = cls._record_format[2]
+            return [cls._from_values(vals[i * n:i * n + n]) for i in range(self._cnt)]
+        if isinstance(packer, CharsPacker):
+            return list(map(packer._decoder, vals))
+        return list(vals)
+
+    # returns the flat values of the batch struct for the array value
+    def _to_batch(self, obj):
+        packer = self._packer
+        if isinstance(packer, ArrayPacker):
+            return [x for row in obj for x in packer._to_batch(row)]
+        if isinstance(packer, StructPacker):
+            return [x for item in obj for x in item._to_values()]
+        if isinstance(packer, CharsPacker):
+            return list(map(packer._encode, obj))
+        return obj
+
+    def _unpack_numpy(self, stream):
+        sz = self._dtype.itemsize
+        dat = stream.read(self._cnt * sz)
+        if len(dat) != self._cnt * sz:
+            raise Binstruct3Error(f"element {len(dat) // sz}: unpack requires a buffer of {sz} bytes")
+        # frombuffer returns a read-only view of the bytes, the copy makes it writable
+        return np.frombuffer(dat, dtype=self._dtype).copy()
+
     def pack(self, stream, obj):
-        itr = iter(obj)
-        for i in range(self._cnt):
+        # the list may have been changed in place after it was validated
+        if len(obj) != self._cnt:
+            raise Binstruct3Error(f"Wrong array size:  needed {self._cnt} values, present {len(obj)} values")
+        if self._dtype is not None:
+            try:
+                dat = np.ascontiguousarray(obj, dtype=self._dtype).tobytes()
+            except (TypeError, ValueError, OverflowError) as e:
+                raise Binstruct3Error(str(e))
+            stream.write(dat)
+            return
+        if self._batch is not None:
+            try:
+                stream.write(self._batch.pack(*self._to_batch(obj)))
+                return
+            except Exception:
+                # nothing is written yet, the per-element loop reports the failing element
+                pass
+        for i, val in enumerate(obj):
             try:
-                val = next(itr)
                 self._packer.pack(stream, val)
-            except StopIteration:
-                Binstruct3Error(f"Incomplete array:  needed {self._cnt} values, present {i} values")
             except Binstruct3Error as e:
                 raise Binstruct3Error(f"element {i}: {str(e)}")
 
     def byte_size(self, obj):
+        if self._elem_sz is not None:
+            return self._cnt * self._elem_sz
         return sum(self._packer.byte_size(x) for x in obj)
 
     def default_value(self):
-        return [self._packer.default_value()] * self._cnt
+        val = self._packer.default_value()
+        if self._dtype is not None:
+            if val is None or val == 0:
+                return np.zeros(self._cnt, dtype=self._dtype)
+            return np.full(self._cnt, val, dtype=self._dtype)
+        if isinstance(val, _IMMUTABLE_TYPES):
+            return [val] * self._cnt
+        # every element gets its own value, mutable ones must not be shared
+        return [val] + [self._packer.default_value() for i in range(self._cnt - 1)] if self._cnt else []
 
     def validate_value(self, obj):
         if len(obj) != self._cnt:
             raise Binstruct3Error(f"Wrong array size:  needed {self._cnt} values, present {len(obj)} values")
+        if self._dtype is not None and isinstance(obj, np.ndarray) and obj.dtype == self._dtype:
+            return
         for i in range(self._cnt):
             self._packer.validate_value(obj[i])
 
@@ -338,25 +664,37 @@ class ArrayPacker(Packer):
 
         if self._defining:
             new_packer = copy.deepcopy(self)
-            packer = new_packer
-            packer._defining += 1
+            new_packer._defining += 1
+            path = [new_packer]
             for i in range(self._defining - 1):
-                packer = packer._packer
-                packer._defining += 1
-            packer._packer = ArrayPacker(packer._packer, item, defining=1)
+                path.append(path[-1]._packer)
+                path[-1]._defining += 1
+            path[-1]._packer = ArrayPacker(path[-1]._packer, item, defining=1)
+            # the batch struct of an array depends on its elements, it is rebuilt from the inside out
+            for packer in reversed(path):
+                packer._compile()
             return new_packer
 
         return ArrayPacker(self, item, defining=1)
 
     def __call__(self, *args, **kwargs):
-        return ArrayPacker(self._packer, self._cnt)
+        return ArrayPacker(self._packer, self._cnt, numpy=self._numpy)
 
     def __str__(self):
         return f"ArrayPacker {self._packer}[{self._cnt}]"
 
 
-def array(packer: Union[Packer, Type[Packable]], count: int,):
-    return ArrayPacker(packer, count)
+# numpy=True keeps a numeric array as numpy.ndarray instead of a list
+def array(packer: Union[Packer, Type[Packable]], count: int, numpy: bool = False):
+    if isinstance(packer, Packer) or inspect.isclass(packer):
+        return _make_array(packer, count, numpy)
+    # a Packable instance is the default of the elements, it may be changed later or be unhashable
+    return ArrayPacker(packer, count, numpy=numpy)
+
+
+@functools.lru_cache(maxsize=256)
+def _make_array(packer: Union[Packer, Type[Packable]], count: int, numpy: bool) -> "ArrayPacker":
+    return ArrayPacker(packer, count, numpy=numpy)
 
 
 class PackerField(Field):
@@ -369,28 +707,28 @@ class PackerField(Field):
             self._packer.validate_value(value)
         except Binstruct3Error as e:
             raise FieldError(self.storage, str(e))
-        setattr(instance, self.storage, value)
+        setattr(instance, self.slot, value)
 
+    # unpacked values are valid by construction and the default is validated once by the packable decorator,
+    # so the value is stored without validate_value
     def fill(self, instance, inpstream: Optional[Any] = None):
         try:
             if inpstream:
                 val = self._packer.unpack(inpstream)
             else:
                 val = self._packer.default_value()
-            self.__set__(instance, val)
-        except Binstruct3Error as e:
+        except _UNPACK_ERRORS as e:
             raise FieldError(self.storage, str(e))
+        setattr(instance, self.slot, val)
 
     def write(self, instance, out_stream):
         try:
-            obj = self.__get__(instance, type(instance))
-            self._packer.pack(out_stream, obj)
+            self._packer.pack(out_stream, getattr(instance, self.slot))
         except Binstruct3Error as e:
             raise FieldError(self.storage, str(e))
 
     def byte_size(self, instance):
-        obj = self.__get__(instance, type(instance))
-        return self._packer.byte_size(obj)
+        return self._packer.byte_size(getattr(instance, self.slot))
 
 
 def get_packer(obj: Union[Packer, Type[Packer], Type[Packable]]):
@@ -402,54 +740,553 @@ def get_packer(obj: Union[Packer, Type[Packer], Type[Packable]]):
         if issubclass(obj, Packer):
             return obj()
         elif issubclass(obj, Packable):
-            return StructPacker(obj())
+            return _make_struct(obj)
     raise ValueError("argument obj has incorrect type")
 
 
+# the default instance of a struct class is created once for all the fields of that class
+@functools.lru_cache(maxsize=256)
+def _make_struct(packable_cls: Type[Packable]) -> StructPacker:
+    return StructPacker(packable_cls())
+
+
 def create_field(packer: Packer):
     return PackerField(packer)
 
 
+# returns the numpy dtype matching a numeric scalar packer, None if there is none
+def _numpy_dtype(packer: Optional[Packer]):
+    fmt = _fusible_format(packer)
+    if fmt is None or fmt[1] not in "bBhHiIqQefd?":
+        return None
+    dtype = np.dtype(fmt[0].replace("!", ">") + fmt[1])
+    return dtype if dtype.itemsize == packer._sz else None
+
+
+# returns (byte order, format, value count) of a field which can be merged into a compound struct.Struct.
+# The count is 0 for scalar fields and the number of packed values for arrays and nested structs
+def _field_format(field: Field) -> Optional[Tuple[str, str, int]]:
+    packer = field._packer if isinstance(field, PackerField) else None
+    # a count of 0 marks a scalar, fields of no values at all are packed on their own
+    if isinstance(packer, StructPacker):
+        record = type(packer._packable)._record_format
+        return record if record is not None and record[2] else None
+    if isinstance(packer, ArrayPacker):
+        if packer._batch is None or not packer._nvals:
+            return None
+        return packer._batch.format[0], packer._batch.format[1:], packer._nvals
+    fmt = _fusible_format(packer)
+    if fmt is None:
+        return None
+    return fmt[0], fmt[1], 0
+
+
+# returns the byte size every value of the packer has, None if it depends on the value
+def _fixed_size(packer: Optional[Packer]) -> Optional[int]:
+    if isinstance(packer, RawPacker) and type(packer).byte_size is RawPacker.byte_size:
+        return packer._sz
+    if isinstance(packer, ArrayPacker):
+        if packer._dtype is not None:
+            return packer._cnt * packer._dtype.itemsize
+        sz = _fixed_size(packer._packer)
+        return None if sz is None else packer._cnt * sz
+    if isinstance(packer, StructPacker):
+        return type(packer._packable)._static_size
+    return None
+
+
+# returns the trailing padding of the last struct at the end of a merged field, 0 if there is none
+def _trailing_padding(packer: Packer) -> int:
+    while isinstance(packer, ArrayPacker):
+        packer = packer._packer
+    if not isinstance(packer, StructPacker):
+        return 0
+    cls = type(packer._packable)
+    order, body, nvals = cls._record_format
+    return struct.calcsize(order + body) - cls._record_end
+
+
+# called by a generated reload when the stream has less data than a run of fields needs
+def _complete_read(layout, size: int, buf: bytes) -> bytes:
+    for storage, end, sz in layout:
+        if len(buf) < end:
+            raise FieldError(storage, f"unpack requires a buffer of {sz} bytes")
+    # only the trailing alignment is missing, the per-field reader tolerates that as well
+    return buf + bytes(size - len(buf))
+
+
+# called by a generated dump when packing a run of fields failed, reports the failing field
+def _raise_pack_error(instance, fields, error: Exception):
+    for name, field in fields:
+        if isinstance(field, PackerField):
+            try:
+                field._packer.validate_value(getattr(instance, field.slot))
+            except Binstruct3Error as e:
+                raise FieldError(field.storage, str(e))
+        field.write(instance, io.BytesIO())
+    if isinstance(error, Binstruct3Error):
+        raise error
+    # every field packs on its own, the error of the whole run is reported for its first field
+    raise FieldError(fields[0][1].storage, str(error)) from error
+
+
+# True if the decorated class or one of its bases defines the attribute. It wins over the generated one
+# as it wins over the one of Packable
+def _user_defined(packable_cls, name: str) -> bool:
+    for klass in packable_cls.__mro__[1:]:
+        if klass is Packable:
+            break
+        # the classes made by packable for decorated bases hold generated methods only
+        if "_fields_cache" not in vars(klass) and name in vars(klass):
+            return True
+    return False
+
+
+# generates reload, dump and byte_size functions specialized for the field layout of the class.
+# Consecutive fixed-size scalar and string fields are handled with one compound struct.Struct per run,
+# other fields are called directly without going through the generic loop
+def _compile_codec(packable_cls, align: int, lazy: bool = False):
+    fields = packable_cls._fields_cache
+    formats = [_field_format(field) for name, field in fields]
+    # the padding is computed here when all the sizes are fixed, then the generated code reads and writes
+    # constant padding only where it is needed
+    padded = align > 1 or packable_cls._pad_to > 1
+    sizes = [_fixed_size(field._packer) if isinstance(field, PackerField) else None for name, field in fields]
+    if not fields or (padded and None in sizes):
+        # padding after a field of unknown size has to be computed from the field sizes at run time
+        return
+
+    runs = []
+    prev_order = None
+    for (name, field), fmt in zip(fields, formats):
+        order = fmt[0] if fmt else None
+        if order is None or order != prev_order:
+            runs.append([])
+        runs[-1].append((name, field, fmt))
+        prev_order = order
+
+    # a struct of fixed-size fields only is read with a single stream.read and written with a single write
+    static = None not in formats
+    namespace = {"_reload": Packable.reload, "_complete_read": _complete_read, "_raise_pack_error": _raise_pack_error,
+                 "_UNPACK_ERRORS": _UNPACK_ERRORS, "FieldError": FieldError}
+    reload_lines = []
+    record_lines = []
+    dump_lines = []
+    size_terms = []
+    static_layout = []
+    getter_lines = []
+    getters = []
+
+    # returns the expression building the field value from the packed values v[first:],
+    # and the expression giving the packed values of the field
+    def expressions(field, packer, count: int, suffix: str, first: int):
+        if f"_from{suffix}" in namespace:
+            return f"_from{suffix}(v[{first}:{first + count}])", f"*_to{suffix}(self.{field.slot})"
+        if not count:
+            if isinstance(packer, CharsPacker):
+                # the encoding is inlined unless a subclass encodes the value itself
+                if type(packer)._encode is CharsPacker._encode:
+                    return f"_dec{suffix}(v[{first}])", f"self.{field.slot}.encode({packer._encoding!r})"
+                return f"_dec{suffix}(v[{first}])", f"_enc{suffix}(self.{field.slot})"
+            return f"v[{first}]", f"self.{field.slot}"
+        if isinstance(packer, CharsPacker):
+            return f"list(map(_dec{suffix}, v[{first}:{first + count}]))", f"*map(_enc{suffix}, self.{field.slot})"
+        return f"list(v[{first}:{first + count}])", f"*self.{field.slot}"
+
+    offs = 0
+    for k, run in enumerate(runs):
+        name, field, fmt = run[0]
+        if fmt is None and isinstance(field, PackerField):
+            # PackerField.fill/write inlined, the packer is called directly
+            namespace.update({f"_unpack{k}": field._packer.unpack, f"_pack{k}": field._packer.pack})
+            for lines, call in ((reload_lines, f"self.{field.slot} = _unpack{k}(stream)"),
+                                (dump_lines, f"_pack{k}(stream, self.{field.slot})")):
+                lines += [
+                    "    try:",
+                    f"        {call}",
+                    "    except _UNPACK_ERRORS as e:",
+                    f"        raise FieldError({field.storage!r}, str(e))",
+                ]
+            namespace[f"_size{k}"] = field._packer.byte_size
+            size_terms.append(f"_size{k}(self.{field.slot})")
+            if padded:
+                offs += _fixed_size(field._packer)
+                skip = _padding(offs, align)
+                if k == len(runs) - 1:
+                    skip += _padding(offs + skip, packable_cls._pad_to)
+                if skip:
+                    reload_lines.append(f"    stream.read({skip})")
+                    dump_lines.append(f"    stream.write({bytes(skip)!r})")
+                    offs += skip
+            continue
+        if fmt is None:
+            namespace[f"_f{k}"] = field
+            reload_lines.append(f"    _f{k}.fill(self, stream)")
+            dump_lines.append(f"    _f{k}.write(self, stream)")
+            size_terms.append(f"_f{k}.byte_size(self)")
+            continue
+
+        parts = []
+        layout = []
+        values = []
+        pack_args = []
+        run_start = offs
+        j = 0
+        for i, (name, field, fmt) in enumerate(run):
+            order, body, count = fmt
+            sz = struct.calcsize(order + body)
+            parts.append(body)
+            field_offs = offs
+            offs += sz
+            # a short read may miss the trailing padding of a nested struct as it may miss the one of this class
+            end = offs - _trailing_padding(field._packer)
+            layout.append((field.storage, end - run_start, sz))
+            static_layout.append((field.storage, end, sz))
+            skip = _padding(offs, align)
+            if i == len(run) - 1 and k == len(runs) - 1:
+                skip += _padding(offs + skip, packable_cls._pad_to)
+            if skip:
+                parts.append(f"{skip}x")
+                offs += skip
+
+            packer = field._packer._packer if isinstance(field._packer, ArrayPacker) else field._packer
+            if isinstance(field._packer, StructPacker):
+                # the nested struct is built straight from its slice of the values
+                nested = type(packer._packable)
+                namespace[f"_from{k}_{i}"] = nested._from_values
+                namespace[f"_to{k}_{i}"] = nested._to_values
+            elif isinstance(packer, (ArrayPacker, StructPacker)):
+                namespace[f"_from{k}_{i}"] = field._packer._from_batch
+                namespace[f"_to{k}_{i}"] = field._packer._to_batch
+            elif isinstance(packer, CharsPacker):
+                namespace[f"_dec{k}_{i}"] = packer._decoder
+                namespace[f"_enc{k}_{i}"] = packer._encode
+            value, stored = expressions(field, packer, count, f"{k}_{i}", j)
+            values.append(f"    self.{field.slot} = {value}")
+            if lazy:
+                # a lazily loaded field is unpacked alone with its own struct on the first access
+                namespace[f"_unpack_field{k}_{i}"] = struct.Struct(order + body).unpack_from
+                getter_lines += [
+                    f"def _get{k}_{i}(buf, base):",
+                    f"    v = _unpack_field{k}_{i}(buf, base + {field_offs})",
+                    f"    return {expressions(field, packer, count, f'{k}_{i}', 0)[0]}",
+                    "",
+                ]
+                getters.append(f"{field.slot!r}: _get{k}_{i}")
+            pack_args.append(stored)
+            j += count or 1
+
+        compiled = struct.Struct(fmt[0] + "".join(parts))
+        namespace[f"_fields{k}"] = tuple((nm, fld) for nm, fld, _ in run)
+        if static:
+            namespace.update({f"_unpack_from{k}": compiled.unpack_from, f"_pack{k}": compiled.pack,
+                              f"_pack_into{k}": compiled.pack_into})
+            reload_lines += [f"    v = _unpack_from{k}(buf, {run_start})", *values]
+            record_lines += [f"        v = _unpack_from{k}(buf, base + {run_start})", *["    " + x for x in values]]
+            # a single run is packed straight into the result, several runs into a preallocated buffer
+            pack = f"return _pack{k}(" if len(runs) == 1 else f"_pack_into{k}(buf, {run_start}, "
+            dump_lines += [
+                "    try:",
+                f"        {pack}{', '.join(pack_args)})",
+                "    except Exception as e:",
+                f"        _raise_pack_error(self, _fields{k}, e)",
+            ]
+            continue
+
+        namespace.update({f"_unpack{k}": compiled.unpack, f"_pack{k}": compiled.pack, f"_layout{k}": tuple(layout)})
+        reload_lines += [
+            f"    buf = stream.read({compiled.size})",
+            f"    if len(buf) != {compiled.size}:",
+            f"        buf = _complete_read(_layout{k}, {compiled.size}, buf)",
+            f"    v = _unpack{k}(buf)",
+            *values,
+        ]
+        dump_lines += [
+            "    try:",
+            f"        data = _pack{k}({', '.join(pack_args)})",
+            "    except Exception as e:",
+            f"        _raise_pack_error(self, _fields{k}, e)",
+            "    stream.write(data)",
+        ]
+
+    if static:
+        namespace["_static_layout"] = tuple(static_layout)
+        # bytes holding the whole record are unpacked in place, other input is read from a stream
+        src = [
+            "def reload(self, stream=None):",
+            f"    if isinstance(stream, (bytes, bytearray)) and len(stream) >= {offs}:",
+            "        buf = stream",
+            "    else:",
+            "        stream = self.get_stream(stream)",
+            "        if not stream:",
+            "            return _reload(self, stream)",
+            f"        buf = stream.read({offs})",
+            f"        if len(buf) != {offs}:",
+            f"            buf = _complete_read(_static_layout, {offs}, buf)",
+            *reload_lines,
+            "",
+        ]
+    else:
+        src = [
+            "def reload(self, stream=None):",
+            "    stream = self.get_stream(stream)",
+            "    if not stream:",
+            "        return _reload(self, stream)",
+            *reload_lines,
+            "",
+        ]
+    if static:
+        # the record is assembled in memory, to_bytes does not need a BytesIO
+        if len(runs) > 1:
+            dump_lines = [f"    buf = bytearray({offs})", *dump_lines, "    return bytes(buf)"]
+        src += [
+            "def to_bytes(self):",
+            *dump_lines,
+            "",
+            "def dump(self, stream):",
+            "    self.get_stream(stream).write(to_bytes(self))",
+            "",
+            "def byte_size(self):",
+            f"    return {offs}",
+            "",
+            # load of several records creates the objects without __init__ and the stream reads
+            "def read_records(cls, buf, count):",
+            *["    # the values are unpacked on access, the data must not change until then",
+              "    if isinstance(buf, bytearray):",
+              "        buf = bytes(buf)"] * lazy,
+            "    ret = []",
+            f"    for base in range(0, count * {offs}, {offs}):",
+            "        self = cls.__new__(cls)",
+            *(["        self._lazy = (buf, base)"] if lazy else record_lines),
+            "        ret.append(self)",
+            "    return ret",
+        ]
+        if lazy:
+            # an unset field slot of a loaded object falls back to __getattr__, which unpacks the field
+            src += [
+                "",
+                *getter_lines,
+                f"_getters = {{{', '.join(getters)}}}",
+                "",
+                "def __getattr__(self, name):",
+                "    get = _getters.get(name)",
+                "    if get is None:",
+                f"        raise AttributeError(f\"{packable_cls.__mro__[1].__name__!r} object has no attribute {{name!r}}\")",
+                "    buf, base = self._lazy",
+                "    val = get(buf, base)",
+                "    setattr(self, name, val)",
+                "    return val",
+            ]
+        if len(runs) == 1:
+            src += [
+                "",
+                "def from_values(cls, v):",
+                "    self = cls.__new__(cls)",
+                *values,
+                "    return self",
+                "",
+                "def to_values(self):",
+                f"    return ({', '.join(pack_args)},)",
+            ]
+        packable_cls._static_size = offs
+    else:
+        src += [
+            "def dump(self, stream):",
+            "    stream = self.get_stream(stream)",
+            *dump_lines,
+            "",
+            # the compound runs have a constant size, only the other fields are asked
+            "def byte_size(self):",
+            f"    return {offs if padded else ' + '.join([str(offs)] * bool(offs) + size_terms)}",
+        ]
+
+    exec(compile("\n".join(src), f"<packable {packable_cls.__mro__[1].__name__}>", "exec"), namespace)
+    # the generated to_bytes packs the fields itself, it would bypass a dump of the class
+    skip = {"to_bytes"} if _user_defined(packable_cls, "dump") else set()
+    for name in ("reload", "dump", "to_bytes", "byte_size", "__getattr__"):
+        if name in namespace and name not in skip and not _user_defined(packable_cls, name):
+            func = namespace[name]
+            func.__qualname__ = f"{packable_cls.__qualname__}.{name}"
+            setattr(packable_cls, name, func)
+    if "__init__" not in vars(packable_cls.__mro__[1]):
+        if "read_records" in namespace:
+            packable_cls._read_records = classmethod(namespace["read_records"])
+        if "from_values" in namespace:
+            packable_cls._from_values = classmethod(namespace["from_values"])
+            packable_cls._to_values = namespace["to_values"]
+            packable_cls._record_format = (compiled.format[0], compiled.format[1:], j)
+            packable_cls._record_end = static_layout[-1][1]
+
+
+# copies an array value, the values in a list of scalars or strings are immutable and shared
+def _copy_flat_list(val):
+    return val.copy() if type(val) is list else _copy_value(val)
+
+
+# generates clone for the fields of the class. Scalar values are immutable and shared, only containers are copied
+def _compile_clone(packable_cls):
+    if _user_defined(packable_cls, "clone"):
+        return
+    namespace = {"_copy_value": _copy_value, "_copy_flat_list": _copy_flat_list}
+    lines = [
+        "def clone(self):",
+        "    new = type(self).__new__(type(self))",
+    ]
+    for name, field in packable_cls._fields_cache:
+        packer = field._packer if isinstance(field, PackerField) else None
+        if isinstance(packer, RawPacker):
+            copy_expr = f"self.{field.slot}"
+        elif isinstance(packer, ArrayPacker) and packer._dtype is None and isinstance(packer._packer, RawPacker):
+            copy_expr = f"_copy_flat_list(self.{field.slot})"
+        else:
+            copy_expr = f"_copy_value(self.{field.slot})"
+        lines.append(f"    new.{field.slot} = {copy_expr}")
+    lines += [
+        "    if self.__dict__:",
+        "        new.__dict__.update({key: _copy_value(val) for key, val in self.__dict__.items()})",
+        "    return new",
+    ]
+    exec(compile("\n".join(lines), f"<packable {packable_cls.__mro__[1].__name__}>", "exec"), namespace)
+    namespace["clone"].__qualname__ = f"{packable_cls.__qualname__}.clone"
+    packable_cls.clone = namespace["clone"]
+
+
+# makes byte_size a constant for a struct of fixed-size fields which the codec could not merge,
+# e.g. nested structs and arrays of them
+def _compile_fixed_size(packable_cls, align: int):
+    if packable_cls._static_size is not None or not packable_cls._fields_cache:
+        return
+    offs = 0
+    for name, field in packable_cls._fields_cache:
+        sz = _fixed_size(field._packer) if isinstance(field, PackerField) else None
+        if sz is None:
+            return
+        offs += sz
+        offs += _padding(offs, align)
+    offs += _padding(offs, packable_cls._pad_to)
+
+    def byte_size(self):
+        return offs
+
+    if not _user_defined(packable_cls, "byte_size"):
+        byte_size.__qualname__ = f"{packable_cls.__qualname__}.byte_size"
+        packable_cls.byte_size = byte_size
+    packable_cls._static_size = offs
+
+
+# builds the numpy structured dtype for a class made of numeric scalars and numpy arrays
+def _compile_numpy_dtype(packable_cls, align: int):
+    if np is None:
+        return
+    names, formats, offsets = [], [], []
+    offs = 0
+    for name, field in packable_cls._fields_cache:
+        packer = field._packer if isinstance(field, PackerField) else None
+        if isinstance(packer, ArrayPacker) and packer._dtype is not None:
+            fmt = (packer._dtype, (packer._cnt,))
+        else:
+            fmt = _numpy_dtype(packer)
+            if fmt is None:
+                return
+        names.append(name)
+        formats.append(fmt)
+        offsets.append(offs)
+        offs += np.dtype(fmt).itemsize
+        offs += _padding(offs, align)
+    offs += _padding(offs, packable_cls._pad_to)
+    if not names:
+        return
+    packable_cls._np_dtype = np.dtype({"names": names, "formats": formats, "offsets": offsets, "itemsize": offs})
+
+    if packable_cls._read_records is None and "__init__" not in vars(packable_cls.__mro__[1]):
+        # numpy array fields are not merged by the codec, load of several records converts them column by column.
+        # The array values of the records are rows of one copied block
+        fields = tuple((field.slot, name, isinstance(field._packer, ArrayPacker))
+                       for name, field in packable_cls._fields_cache)
+
+        def read_records(cls, buf, count):
+            arr = np.frombuffer(buf, cls._np_dtype, count)
+            columns = [list(arr[name].copy()) if is_array else arr[name].tolist() for slot, name, is_array in fields]
+            ret = []
+            for values in zip(*columns):
+                self = cls.__new__(cls)
+                for (slot, name, is_array), val in zip(fields, values):
+                    setattr(self, slot, val)
+                ret.append(self)
+            return ret
+
+        read_records.__qualname__ = f"{packable_cls.__qualname__}.read_records"
+        packable_cls._read_records = classmethod(read_records)
+
+
 # returns the subclass of Packable. It has attributes of Field inside, to read, write data from binaries and
 # to save them in storage
 
 
-def packable(align: int):
+# pad_to pads the size of the whole struct to a multiple of it, e.g. 8 or 64 for structs used in large arrays.
+# lazy=True makes load keep the data and unpack each field on its first access, for wide structs of which
+# only a few fields are read. It needs fixed-size fields and no __init__
+def packable(align: int, pad_to: int = 1, lazy: bool = False):
     def _packable(cls) -> Type[Packable]:
         # initializing packed fields
         for name, val in cls.__dict__.items():
             try:
-                pack = get_packer(val)
-                fld = create_field(pack)
-                setattr(cls, name, fld)
-                fld.storage = f"{cls.__name__}.{name}"
+                setattr(cls, name, create_field(get_packer(val)))
             except ValueError:
                 pass
 
+        fields_cache = tuple((nm, obj) for nm, obj in cls.__dict__.items() if isinstance(obj, Field))
+        for name, fld in fields_cache:
+            # Field instances put into the class body directly are named too
+            fld.storage = sys.intern(f"{cls.__name__}.{name}")
+            fld.slot = sys.intern(f"_v_{name}")
+            if isinstance(fld, PackerField):
+                try:
+                    fld._packer.validate_value(fld._packer.default_value())
+                except Binstruct3Error as e:
+                    raise FieldError(fld.storage, f"wrong default value: {str(e)}")
+        has_init = "__init__" in cls.__dict__
+
         # add Packable mixin to our class
         class MyPackable(cls, Packable):
+            # every field value is kept in its own slot, named by Field.slot
+            __slots__ = tuple(obj.slot for nm, obj in fields_cache) + ("_lazy",) * lazy
+            _fields_cache = fields_cache
+            _align = align
+            _pad_to = pad_to
 
             def __init__(self, *args):
 
-                self._align = align
+                fields = self._fields_cache
 
-                for name, field in self.fields():
-                    field.fill(self)
+                if has_init or not args:
+                    # a user __init__ may read the fields, they all get their defaults first
+                    for name, field in fields:
+                        field.fill(self)
+                    if has_init:
+                        super().__init__(*args)
+                    return
 
-                if "__init__" in cls.__dict__.keys():
-                    super().__init__(*args)
-                else:
-                    for (name, field), val in zip(self.fields(), args):
-                        field.__set__(self, val)
+                # fields given positionally are not filled with defaults which would be overwritten
+                for (name, field), val in zip(fields, args):
+                    field.__set__(self, val)
+                for name, field in fields[len(args):]:
+                    field.fill(self)
 
             def __repr__(self):
-                dats = []
-                for nm, obj in cls.__dict__.items():
-                    if isinstance(obj, Field):
-                        dats.append(f"{nm} = {obj.__get__(self, type(self))}")
-                vals = ', '.join(dats)
+                vals = ', '.join(f"{nm} = {getattr(self, obj.slot)}" for nm, obj in self._fields_cache)
                 return f"{cls.__name__}({vals})"
 
+        _compile_codec(MyPackable, align, lazy)
+        _compile_fixed_size(MyPackable, align)
+        _compile_clone(MyPackable)
+        _compile_numpy_dtype(MyPackable, align)
+        if any(_user_defined(MyPackable, name) for name in ("reload", "dump", "byte_size")):
+            # the class has its own layout, load and containing structs may not bypass its methods
+            MyPackable._static_size = MyPackable._read_records = MyPackable._record_format = None
+            MyPackable._np_dtype = None
+        if lazy and (MyPackable._read_records is None or _user_defined(MyPackable, "__getattr__")):
+            raise ValueError("lazy=True needs a struct of fixed-size fields without __init__, reload and __getattr__")
         return MyPackable
 
     return _packable
@@ -30,5 +30,6 @@ setup(
     install_requires=requires,
     extras_require={
         'testing': tests_require,
+        'numpy': ['numpy'],
     },
 )
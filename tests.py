@@ -1,6 +1,18 @@
+import enum
+import io
+import os
+import struct
+import subprocess
+import sys
 import unittest
 
-from binstruct3 import packable, int32, int8, array, FieldError, int16, char
+from binstruct3 import packable, int32, int8, array, FieldError, int16, char, uint32, RawPacker, Binstruct3Error, \
+    Field, CharsPacker
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 @packable(align=1)
@@ -23,6 +35,44 @@ class StreamReadTests(unittest.TestCase):
             self.assertEqual(point.x, 1)
             self.assertEqual(point.y, 2)
 
+    def test_reading_from_buffers(self):
+        data = b"\x01\x00\x00\x00\x02\x00\x00\x00\x03"
+        for buf in (bytearray(data), memoryview(data)):
+            point = Point.load(buf)
+            self.assertEqual((point.x, point.y), (1, 2))
+        point.reload(data[4:] + bytes(3))
+        self.assertEqual((point.x, point.y), (2, 3))
+
+    def test_reading_multiple_values_insufficient(self):
+        with self.assertRaises(FieldError) as ctx:
+            Point.load(b"\x01\x00\x00\x00\x02\x00\x00\x00\x03\x00\x00\x00", count=2)
+        self.assertEqual(ctx.exception.field_name, "Point.y")
+
+    def test_lazy_load(self):
+        @packable(align=2, lazy=True)
+        class A:
+            a = int8
+            b = int16[2]
+            c = char[3](encoding='latin-1')
+
+        data = bytearray(b"\x01H\x02\x00\x03\x00abcH" * 2)
+        a, b = A.load(data, count=2)
+        data[0] = 7
+        self.assertEqual((a.a, a.b, a.c), (1, [2, 3], "abc"))
+        b.b = [4, 5]
+        self.assertEqual(b.to_bytes(), b"\x01\x00\x04\x00\x05\x00abc\x00")
+        b.reload(b"\x06H\x07\x00\x08\x00de\x00H")
+        self.assertEqual((b.a, b.b, b.c), (6, [7, 8], "de"))
+        self.assertRaises(AttributeError, getattr, a, "d")
+
+        with self.assertRaises(ValueError):
+            @packable(align=1, lazy=True)
+            class B:
+                a = int8
+
+                def __init__(self):
+                    pass
+
     def test_sub_struct_reading(self):
         @packable(align=1)
         class A:
@@ -75,6 +125,11 @@ class StreamReadTests(unittest.TestCase):
     def test_insufficient_stream_size_exception(self):
         self.assertRaises(FieldError, Point.load, b"\x01\x00\x00\x00\x02\x00")
 
+    def test_insufficient_stream_field_name(self):
+        with self.assertRaises(FieldError) as ctx:
+            Point.load(b"\x01\x00\x00\x00\x02\x00")
+        self.assertEqual(ctx.exception.field_name, "Point.y")
+
 
 class WriteTests(unittest.TestCase):
 
@@ -100,6 +155,231 @@ class WriteTests(unittest.TestCase):
         a.g[3] = 4
         a.to_bytes()
 
+    def test_incomplete_array_exception(self):
+        @packable(align=1)
+        class A:
+            g = int8[4]
+
+        a = A(list(range(4)))
+        a.g.pop()
+        self.assertRaises(FieldError, a.to_bytes)
+
+    def test_grown_array_exception(self):
+        @packable(align=1)
+        class P:
+            x = int8
+
+            def __init__(self, x=1):
+                self.x = x
+
+        @packable(align=1)
+        class A:
+            g = int8(5)[2]
+            p = array(P, 2)
+
+        a = A()
+        a.g.append(3)
+        with self.assertRaises(FieldError) as ctx:
+            a.to_bytes()
+        self.assertEqual(ctx.exception.field_name, "A.g")
+        a.g.pop()
+        a.p.append(P())
+        with self.assertRaises(FieldError) as ctx:
+            a.to_bytes()
+        self.assertEqual(ctx.exception.field_name, "A.p")
+        a.p.pop()
+        self.assertEqual(a.to_bytes(), b"\x05\x05\x01\x01")
+
+    def test_raw_packer_subclass(self):
+        class Color(enum.IntEnum):
+            RED = 1
+            GREEN = 2
+
+        class ColorPacker(RawPacker):
+            def unpack(self, stream):
+                return Color(super().unpack(stream))
+
+        class FixedPoint(RawPacker):
+            def unpack(self, stream):
+                return super().unpack(stream) / 100
+
+            def pack(self, stream, obj):
+                super().pack(stream, round(obj * 100))
+
+            def validate_value(self, obj):
+                super().validate_value(round(obj * 100))
+
+        @packable(align=1)
+        class A:
+            c = ColorPacker("B", Color.GREEN)
+            f = FixedPoint("<i", 1.5)
+            g = array(ColorPacker("B", Color.RED), 2)
+
+        self.assertEqual(A().to_bytes(), b"\x02\x96\x00\x00\x00\x01\x01")
+        a = A.load(b"\x02\x10\x27\x00\x00\x01\x02")
+        self.assertEqual((a.c, a.f, a.g), (Color.GREEN, 100.0, [Color.RED, Color.GREEN]))
+        self.assertIsInstance(a.g[1], Color)
+
+    def test_run_pack_error(self):
+        from binstruct3 import _raise_pack_error
+
+        with self.assertRaises(FieldError) as ctx:
+            _raise_pack_error(Point(), Point._fields_cache, struct.error("pack failed"))
+        self.assertEqual(ctx.exception.field_name, "Point.x")
+
+    def test_array_round_trip(self):
+        @packable(align=1)
+        class A:
+            g = int16[3]
+            h = char[2][3](encoding='latin-1')
+
+        data = b"\x01\x00\x02\x00\x03\x00ab\x00cde"
+        a = A.load(data)
+        self.assertEqual(a.g, [1, 2, 3])
+        self.assertEqual(a.h, ["ab", "cde"])
+        self.assertEqual(a.to_bytes(), data)
+
+    def test_bytes_array_round_trip(self):
+        @packable(align=1)
+        class A:
+            g = array(RawPacker("s"), 3)
+
+        a = A.load(b"abc")
+        self.assertEqual(a.g, [b"a", b"b", b"c"])
+        self.assertEqual(a.to_bytes(), b"abc")
+
+    def test_multidimensional_array_round_trip(self):
+        @packable(align=1)
+        class A:
+            g = int8[2][3]
+            p = Point
+
+        data = b"\x01\x02\x03\x04\x05\x06\x07\x00\x00\x00\x08\x00\x00\x00"
+        a = A.load(data)
+        self.assertEqual(a.g, [[1, 2, 3], [4, 5, 6]])
+        self.assertEqual(a.to_bytes(), data)
+        a.g[1].pop()
+        self.assertRaises(FieldError, a.to_bytes)
+
+    def test_nested_struct_round_trip(self):
+        @packable(align=1)
+        class B:
+            g = int8(1)[2]
+            s = char[3]("ab", encoding='latin-1')
+
+        @packable(align=1)
+        class A:
+            b = B
+            p = array(B, 2)
+
+        data = b"\x01\x02xyz\x03\x04abc\x05\x06de\x00"
+        a = A.load(data)
+        self.assertEqual((a.b.g, a.b.s, a.p[1].g, a.p[1].s), ([1, 2], "xyz", [5, 6], "de"))
+        self.assertEqual(a.to_bytes(), data)
+        a.p[1].g.pop()
+        with self.assertRaises(FieldError) as ctx:
+            a.to_bytes()
+        self.assertEqual(ctx.exception.field_name, "A.p")
+
+    def test_mixed_fields_round_trip(self):
+        @packable(align=1)
+        class A:
+            a = int8(1)
+            b = int16[3]
+            p = Point
+            c = char[4]("xy", encoding='latin-1')
+
+        a = A()
+        a.b = [2, 3, 4]
+        data = a.to_bytes()
+        self.assertEqual(data, b"\x01\x02\x00\x03\x00\x04\x00\x05\x00\x00\x00\x06\x00\x00\x00xy\x00\x00")
+        self.assertEqual(a.byte_size(), len(data))
+        b = A.load(data)
+        self.assertEqual(b.b, [2, 3, 4])
+        self.assertEqual(b.p.x, 5)
+        self.assertEqual(b.c, "xy")
+
+    def test_mixed_byte_order(self):
+        @packable(align=2)
+        class A:
+            a = int8(1)
+            b = RawPacker(">I")(2)
+            c = int16(3)
+
+        a = A()
+        data = a.to_bytes()
+        self.assertEqual(data, b"\x01\x00\x00\x00\x00\x02\x03\x00")
+        self.assertEqual(a.byte_size(), len(data))
+        b = A.load(data)
+        self.assertEqual((b.a, b.b, b.c), (1, 2, 3))
+
+    def test_user_defined_methods(self):
+        @packable(align=1)
+        class A:
+            a = int32(1)
+
+            def to_bytes(self):
+                return b"custom"
+
+            def byte_size(self):
+                return 99
+
+            def reload(self, stream=None):
+                self.a = 7
+
+        @packable(align=1)
+        class B:
+            p = A
+
+        a = A()
+        self.assertEqual((a.to_bytes(), a.byte_size()), (b"custom", 99))
+        self.assertEqual(A.load(b"\x01\x00\x00\x00").a, 7)
+        self.assertEqual(B.load(b"\x01\x00\x00\x00").p.a, 7)
+        self.assertEqual(B().byte_size(), 99)
+
+        @packable(align=1)
+        class P:
+            a = int8(1)
+
+            def clone(self):
+                return "P-clone"
+
+        @packable(align=1)
+        class Q(P):
+            b = int8(2)
+
+            def to_bytes(self):
+                return b"Q-custom"
+
+            def byte_size(self):
+                return 42
+
+        q = Q()
+        self.assertEqual((q.to_bytes(), q.byte_size(), q.clone()), (b"Q-custom", 42, "P-clone"))
+
+        @packable(align=1)
+        class C:
+            a = int32(1)
+
+            def dump(self, stream):
+                stream.write(b"CUSTOM")
+
+        self.assertEqual(C().to_bytes(), b"CUSTOM")
+
+    def test_to_bytes_repeated(self):
+        @packable(align=1)
+        class A:
+            a = int32(1)
+            p = Point
+
+        @packable(align=1)
+        class B:
+            a = int8(2)
+            p = Point
+
+        self.assertEqual(A().to_bytes(), b"\x01\x00\x00\x00\x05\x00\x00\x00\x06\x00\x00\x00")
+        self.assertEqual(B().to_bytes(), b"\x02\x05\x00\x00\x00\x06\x00\x00\x00")
+
 
 class InitializationTests(unittest.TestCase):
 
@@ -116,6 +396,32 @@ class InitializationTests(unittest.TestCase):
         v = A()
         self.assertEqual(v.a, None)
 
+    def test_custom_field(self):
+        class Prefixed(Field):
+            def fill(self, instance, inpstream=None):
+                val = inpstream.read(inpstream.read(1)[0]) if inpstream else b""
+                setattr(instance, self.slot, val)
+
+            def write(self, instance, outstream):
+                val = getattr(instance, self.slot)
+                outstream.write(bytes([len(val)]) + val)
+
+            def byte_size(self, instance):
+                return 1 + len(getattr(instance, self.slot))
+
+        @packable(align=1)
+        class A:
+            a = int8(1)
+            s = Prefixed()
+            b = int8(2)
+
+        a = A()
+        a.s = b"xyz"
+        self.assertEqual(a.to_bytes(), b"\x01\x03xyz\x02")
+        self.assertEqual(a.byte_size(), 6)
+        b = A.load(b"\x05\x02ab\x06")
+        self.assertEqual((b.a, b.s, b.b), (5, b"ab", 6))
+
     def test_empty_array(self):
         @packable(align=1)
         class A:
@@ -133,6 +439,18 @@ class InitializationTests(unittest.TestCase):
         for val in v.a:
             self.assertEqual(val, 5)
 
+    def test_array_defaults_not_shared(self):
+        @packable(align=1)
+        class A:
+            g = int8[2][3]
+            p = array(Point, 2)
+
+        v = A()
+        v.g[0][0] = 1
+        v.p[0].x = 1
+        self.assertEqual(v.g[1][0], None)
+        self.assertEqual(v.p[1].x, 5)
+
     def test_autoinit_function(self):
         @packable(align=1)
         class MyStruct:
@@ -191,6 +509,21 @@ class InitializationTests(unittest.TestCase):
         self.assertEqual(len(market.rows), 2)
         self.assertEqual(len(market.rows[0]), 5)
 
+    def test_shared_packers(self):
+        self.assertIs(int32(5), int32(5))
+        self.assertIsNot(int8(1), int8(True))
+        self.assertIs(array(Point, 2), array(Point, 2))
+
+        @packable(align=1)
+        class A:
+            a = array(Point, 2)
+            b = array(Point, 2)
+
+        a = A()
+        a.a[0].x = 1
+        self.assertEqual(a.b[0].x, 5)
+        self.assertEqual(A().a[0].x, 5)
+
     def test_struct_init_function(self):
         @packable(align=1)
         class A:
@@ -202,6 +535,103 @@ class InitializationTests(unittest.TestCase):
         self.assertEqual(a.p.x, 7)
         self.assertEqual(a.p.y, 8)
 
+    def test_clone(self):
+        @packable(align=1)
+        class A:
+            a = int8(32)
+            g = int8[2][2]
+            p = Point
+
+        a = A()
+        a.g = [[1, 2], [3, 4]]
+        b = a.clone()
+        b.a = 1
+        b.g[0][0] = 5
+        b.p.x = 7
+        self.assertEqual(a.a, 32)
+        self.assertEqual(a.g, [[1, 2], [3, 4]])
+        self.assertEqual(a.p.x, 5)
+        self.assertEqual(b.to_bytes(), b"\x01\x05\x02\x03\x04\x07\x00\x00\x00\x06\x00\x00\x00")
+
+    def test_nested_defaults_not_shared(self):
+        @packable(align=1)
+        class B:
+            g = int8(1)[3]
+
+        @packable(align=1)
+        class A:
+            b = B
+            e = array(B, 2)
+
+        a1, a2 = A(), A()
+        a1.b.g[0] = 5
+        a1.e[1].g[2] = 6
+        self.assertEqual(a2.b.g, [1, 1, 1])
+        self.assertEqual(a2.e[1].g, [1, 1, 1])
+        self.assertEqual(a1.e[0].g, [1, 1, 1])
+
+    def test_zero_length_arrays(self):
+        @packable(align=1)
+        class A:
+            a = int8(1)
+            p = array(Point, 0)
+            g = int8[0]
+            h = int8[2][0]
+
+        a = A()
+        self.assertEqual((a.p, a.g, a.h), ([], [], [[], []]))
+        self.assertEqual(a.to_bytes(), b"\x01")
+        b = A.load(b"\x02")
+        self.assertEqual((b.a, b.p, b.h), (2, [], [[], []]))
+
+    def test_array_of_instance(self):
+        class E:
+            x = int8(1)
+
+            def __eq__(self, other):
+                return self is other
+
+        E = packable(align=1)(E)
+        e = E()
+        e.x = 9
+        self.assertEqual(array(e, 2).default_value()[1].x, 9)
+        e.x = 4
+        self.assertEqual(array(e, 2).default_value()[1].x, 4)
+
+    def test_extra_attributes(self):
+        @packable(align=1)
+        class A:
+            a = int8(32)
+
+            def __init__(self, name):
+                self.name = name
+
+        a = A("first")
+        b = a.clone()
+        self.assertEqual(b.name, "first")
+        self.assertEqual(b.a, 32)
+        self.assertNotIn(32, vars(a).values())
+
+    def test_wrong_default_val(self):
+        with self.assertRaises(FieldError) as ctx:
+            @packable(align=1)
+            class A:
+                a = int32
+                b = int8(300)
+        self.assertEqual(ctx.exception.field_name, "A.b")
+
+    def test_set_out_of_range_val(self):
+        @packable(align=1)
+        class A:
+            a = int8
+            b = uint32
+            s = char[4]
+
+        a = A()
+        a.a, a.b = -128, 0xffffffff
+        for name, val in (("a", 128), ("b", -1), ("s", 5)):
+            self.assertRaises(FieldError, setattr, a, name, val)
+
     def test_set_wrong_val(self):
 
         @packable(align=1)
@@ -264,6 +694,15 @@ class InitializationTests(unittest.TestCase):
 
 class CharsTests(unittest.TestCase):
 
+    def test_locale_without_encoding(self):
+        env = dict(os.environ, LC_ALL="C", LC_CTYPE="C", LANG="C", LANGUAGE="")
+        code = ("import locale, binstruct3; assert locale.getdefaultlocale()[1] is None; "
+                "print(binstruct3.packable(align=1)(type('A', (), {'s': binstruct3.char[4]('ab')}))().to_bytes())")
+        out = subprocess.run([sys.executable, "-W", "ignore", "-c", code], env=env, capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)))
+        self.assertEqual(out.returncode, 0, out.stderr)
+        self.assertEqual(out.stdout.strip(), "b'ab\\x00\\x00'")
+
     def test_init_empty_str(self):
         @packable(align=1)
         class A:
@@ -277,6 +716,33 @@ class CharsTests(unittest.TestCase):
         self.assertEqual(a.f1, "")
         self.assertEqual(a.f2, "")
 
+    def test_chars_packer_subclass_decode(self):
+        class Upper(CharsPacker):
+            def _decode(self, val):
+                return super()._decode(val).upper()
+
+        self.assertEqual(Upper(None, 4, 'latin-1').unpack(io.BytesIO(b"cd\x00\x00")), "CD")
+
+        @packable(align=1)
+        class A:
+            s = Upper("ab", 4, 'latin-1')
+            g = array(Upper("x", 2, 'latin-1'), 2)
+
+        a = A.load(b"cd\x00\x00efgh")
+        self.assertEqual((a.s, a.g), ("CD", ["EF", "GH"]))
+
+    def test_chars_packer_subclass_encode(self):
+        class Lower(CharsPacker):
+            def _encode(self, val):
+                return super()._encode(val.lower())
+
+        @packable(align=1)
+        class A:
+            a = int8(1)
+            s = Lower("XY", 4, 'latin-1')
+
+        self.assertEqual(A().to_bytes(), b"\x01xy\x00\x00")
+
     def test_init_str(self):
         @packable(align=1)
         class A:
@@ -327,6 +793,23 @@ class CharsTests(unittest.TestCase):
         for name in personnel.names:
             self.assertEqual(name, "Jose")
 
+    def test_bytes_after_terminator_not_decoded(self):
+        @packable(align=1)
+        class A:
+            f1 = char[6](encoding='utf-8')
+
+        a = A.load(b"abc\x00\xff\xfe")
+        self.assertEqual(a.f1, "abc")
+
+    def test_wide_encoding(self):
+        @packable(align=1)
+        class A:
+            f1 = char[8](encoding='utf-16-le')
+
+        a = A.load("ab".encode('utf-16-le') + b"\x00" * 4)
+        self.assertEqual(a.f1, "ab")
+        self.assertEqual(a.to_bytes(), b"a\x00b\x00\x00\x00\x00\x00")
+
     def test_write_str(self):
         pass
 
@@ -370,6 +853,26 @@ class AlignTests(unittest.TestCase):
         b = B()
         self.assertEqual(b.byte_size(), 52)
 
+    def test_read_unseekable_stream(self):
+        class Stream:
+            def __init__(self, data):
+                self.data = data
+
+            def read(self, size):
+                ret, self.data = self.data[:size], self.data[size:]
+                return ret
+
+        @packable(align=4)
+        class A:
+            f1 = int8
+            f2 = Point
+            f3 = int8
+
+        stream = Stream(b"\x01HHH\x02\x00\x00\x00\x03\x00\x00\x00\x04HHH\x05")
+        a = A.load(stream)
+        self.assertEqual((a.f1, a.f2.x, a.f2.y, a.f3), (1, 2, 3, 4))
+        self.assertEqual(stream.data, b"\x05")
+
     def test_read_int(self):
         @packable(align=4)
         class A:
@@ -395,6 +898,100 @@ class AlignTests(unittest.TestCase):
         self.assertEqual(a.f1, "abc")
         self.assertEqual(a.f2, "cde")
 
+    def test_read_without_trailing_padding(self):
+        @packable(align=4)
+        class A:
+            f1 = int32
+            f2 = int8
+
+        a = A.load(b"\x01\x00\x00\x00\x02")
+        self.assertEqual(a.f1, 1)
+        self.assertEqual(a.f2, 2)
+
+    def test_pad_to(self):
+        @packable(align=1, pad_to=8)
+        class A:
+            f1 = int8(1)
+            f2 = int16(2)
+
+        @packable(align=1)
+        class B:
+            f1 = array(A, 2)
+            f2 = int8(3)
+
+        a = A()
+        self.assertEqual(a.byte_size(), 8)
+        self.assertEqual(a.to_bytes(), b"\x01\x02\x00\x00\x00\x00\x00\x00")
+        b = B()
+        self.assertEqual(b.byte_size(), 17)
+        b = B.load(b"\x04\x05\x00HHHHH\x06\x07\x00HHHHH\x08")
+        self.assertEqual([(x.f1, x.f2) for x in b.f1], [(4, 5), (6, 7)])
+        self.assertEqual(b.f2, 8)
+
+    def test_pad_to_mixed_fields(self):
+        @packable(align=1, pad_to=4)
+        class A:
+            f1 = int8(1)
+            f2 = int8[2]
+
+        a = A.load(b"\x01\x02\x03H\x04")
+        self.assertEqual(a.f2, [2, 3])
+        self.assertEqual(a.byte_size(), 4)
+        self.assertEqual(a.to_bytes(), b"\x01\x02\x03\x00")
+
+    def test_nested_fixed_size(self):
+        @packable(align=4)
+        class A:
+            f1 = int8(1)
+            f2 = array(Point, 2)
+            f3 = int16(2)
+
+        a = A()
+        self.assertEqual(A._static_size, 24)
+        self.assertEqual(a.byte_size(), len(a.to_bytes()))
+        b = A.load(a.to_bytes())
+        self.assertEqual((b.f1, b.f2[1].y, b.f3), (1, 6, 2))
+
+    def test_nested_trailing_padding_missing(self):
+        @packable(align=4)
+        class B:
+            a = int32(1)
+            b = int8(2)
+
+        @packable(align=1)
+        class A:
+            c = int8(3)
+            p = array(B, 2)
+
+        data = A().to_bytes()
+        self.assertEqual(len(data), 17)
+        a = A.load(data[:-3])
+        self.assertEqual((a.c, a.p[1].a, a.p[1].b), (3, 1, 2))
+        with self.assertRaises(FieldError) as ctx:
+            A.load(data[:-4])
+        self.assertEqual(ctx.exception.field_name, "A.p")
+
+    def test_padding_around_unmerged_fields(self):
+        @packable(align=1)
+        class B:
+            x = int16(2)
+
+            def __init__(self):
+                self.extra = 3
+
+        @packable(align=4, pad_to=8)
+        class A:
+            f1 = int8(1)
+            f2 = B
+            f3 = int8(4)
+            f4 = B
+
+        data = b"\x01HHH\x05\x00HH\x06HHH\x07\x00HH"
+        a = A.load(data)
+        self.assertEqual((a.f1, a.f2.x, a.f3, a.f4.x, a.f4.extra), (1, 5, 6, 7, 3))
+        self.assertEqual(a.byte_size(), 16)
+        self.assertEqual(a.to_bytes(), data.replace(b"H", b"\x00"))
+
     def test_write_int(self):
         @packable(align=4)
         class A:
@@ -413,3 +1010,106 @@ class AlignTests(unittest.TestCase):
 
         a = A("abc", "cde")
         self.assertEqual(a.to_bytes(), b"abc\x00cde\x00")
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class NumpyTests(unittest.TestCase):
+
+    def test_read_array(self):
+        @packable(align=1)
+        class A:
+            a = int8
+            g = array(uint32, 3, numpy=True)
+
+        a = A.load(b"\x07\x01\x00\x00\x00\x02\x00\x00\x00\x03\x00\x00\x00")
+        self.assertEqual(a.a, 7)
+        self.assertIsInstance(a.g, np.ndarray)
+        self.assertEqual(a.g.dtype, np.uint32)
+        self.assertEqual(a.g.tolist(), [1, 2, 3])
+        a.g[0] = 5
+        self.assertEqual(a.to_bytes(), b"\x07\x05\x00\x00\x00\x02\x00\x00\x00\x03\x00\x00\x00")
+        self.assertEqual(a.byte_size(), 13)
+
+    def test_read_array_records(self):
+        @packable(align=2)
+        class A:
+            a = int8
+            g = array(RawPacker(">H"), 2, numpy=True)
+
+        data = bytearray(b"\x07H\x00\x01\x00\x02\x08H\x00\x03\x00\x04")
+        a, b = A.load(data, count=2)
+        data[2:4] = b"\xff\xff"
+        self.assertEqual((a.a, a.g.tolist(), b.a, b.g.tolist()), (7, [1, 2], 8, [3, 4]))
+        a.g[1] = 5
+        self.assertEqual(b.g.tolist(), [3, 4])
+        self.assertEqual(a.to_bytes(), b"\x07\x00\x00\x01\x00\x05")
+
+    def test_read_padded_records(self):
+        @packable(align=4)
+        class A:
+            a = int8
+            g = array(uint32, 2, numpy=True)
+            b = int16
+
+        self.assertIsNotNone(A._read_records)
+        data = b"\x07HHH\x01\x00\x00\x00\x02\x00\x00\x00\x03\x00HH"
+        for src in (data * 2, io.BytesIO(data * 2)):
+            a, b = A.load(src, count=2)
+            self.assertEqual((a.a, a.g.tolist(), b.b), (7, [1, 2], 3))
+            self.assertIsInstance(a.a, int)
+        # without the trailing padding the records are read one by one
+        a = A.load(data[:14])
+        self.assertEqual((a.a, a.g.tolist(), a.b), (7, [1, 2], 3))
+        self.assertEqual(a.to_bytes(), b"\x07\x00\x00\x00\x01\x00\x00\x00\x02\x00\x00\x00\x03\x00\x00\x00")
+        with self.assertRaises(FieldError) as ctx:
+            A.load(data[:6])
+        self.assertEqual(ctx.exception.field_name, "A.g")
+
+    def test_default_value(self):
+        @packable(align=1)
+        class A:
+            g = array(int16, 2, numpy=True)
+            h = array(int16(3), 2, numpy=True)
+
+        a = A()
+        self.assertEqual(a.g.tolist(), [0, 0])
+        self.assertEqual(a.h.tolist(), [3, 3])
+        self.assertEqual(a.to_bytes(), b"\x00\x00\x00\x00\x03\x00\x03\x00")
+
+    def test_write_list(self):
+        @packable(align=1)
+        class A:
+            g = array(int16, 2, numpy=True)
+
+        a = A([1, -1])
+        self.assertEqual(a.to_bytes(), b"\x01\x00\xff\xff")
+
+    def test_insufficient_stream(self):
+        @packable(align=1)
+        class A:
+            g = array(int16, 2, numpy=True)
+
+        self.assertRaises(FieldError, A.load, b"\x01\x00\xff")
+
+    def test_load_many(self):
+        @packable(align=4)
+        class A:
+            a = int8
+            g = array(int16, 2, numpy=True)
+
+        data = b"\x01HHH\x02\x00\x03\x00" + b"\x04HHH\x05\x00\x06\x00"
+        arr = A.load_many(data, 2)
+        self.assertEqual(arr.dtype.itemsize, 8)
+        self.assertEqual(arr["a"].tolist(), [1, 4])
+        self.assertEqual(arr["g"].tolist(), [[2, 3], [5, 6]])
+        self.assertRaises(Binstruct3Error, A.load_many, data, 3)
+
+    def test_load_many_not_numeric(self):
+        @packable(align=1)
+        class A:
+            a = char[4]
+
+        self.assertRaises(Binstruct3Error, A.load_many, b"abcd", 1)
+
+    def test_non_numeric_element(self):
+        self.assertRaises(ValueError, array, char[4], 2, numpy=True)